@@ -19,6 +19,8 @@ import yaml
 
 from gaarf_exporter.alert_elements import AlertRule
 
+_YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
 
 class Alert:
   def __init__(
@@ -36,4 +38,4 @@ class Alert:
   @property
   def text(self) -> dict[str, str]:
     d = {'alert': self.name, 'expr': self.alert_rule, 'for': self.duration}
-    return yaml.safe_dump(d)
+    return yaml.dump(d, Dumper=_YAML_DUMPER)
@@ -19,6 +19,8 @@ import smart_open
 import yaml
 from gaarf import api_clients, query_executor
 
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 
 def inject_dependencies(
   api_version: str | None = None,
@@ -49,7 +51,7 @@ def inject_dependencies(
       'convert_fake_report': True,
     }
   with smart_open.open(ads_config_path, 'r', encoding='utf-8') as f:
-    google_ads_config_dict = yaml.safe_load(f)
+    google_ads_config_dict = yaml.load(f, Loader=_YAML_LOADER)
   if not account:
     account = google_ads_config_dict.get('login_customer_id')
   if not account:
@@ -31,7 +31,9 @@ from __future__ import annotations
 import copy
 import dataclasses
 import enum
+import functools
 import itertools
+import sys
 from collections.abc import Mapping, MutableSequence, Sequence
 from datetime import datetime
 from typing import TypedDict
@@ -75,13 +77,17 @@ class CollectorCustomization(TypedDict):
 class Field:
   """Helper class for defining Google Ads API field.
 
-  Field can be a metric, dimension or segment.
+  Field can be a metric, dimension or segment. Fields are immutable so their
+  comparison keys are computed only once and the same instance can be safely
+  shared between collectors.
 
   Attributes:
       name: Name of the field, i.e. metric.clicks.
       alias: Optional alias for the field, i.e. clicks.
   """
 
+  __slots__ = ('_name', '_alias', '_query_field', '_key', '_hash')
+
   def __init__(self, name: str, alias: str | None = None) -> None:
     """Initializes Field.
 
@@ -89,15 +95,37 @@ class Field:
       name: Name of the field, i.e. metric.clicks.
       alias: Optional alias for the field, i.e. clicks.
     """
-    self.name = name
-    self.alias = alias or name.replace('.', '_')
+    # The same names and aliases repeat across collectors, so they are
+    # interned to be stored (and compared) only once.
+    self._name = sys.intern(name)
+    self._alias = sys.intern(alias or name.replace('.', '_'))
+    self._query_field = (
+      f'{self.name} AS {self.alias}' if self.alias else self.name
+    )
+    self._key = sys.intern(util.remove_spaces(self._query_field))
+    self._hash = hash(
+      (
+        util.remove_spaces(self.name),
+        util.remove_spaces(self.alias if self.alias else ''),
+      )
+    )
+
+  @property
+  def name(self) -> str:
+    """Name of the field."""
+    return self._name
+
+  @property
+  def alias(self) -> str:
+    """Alias of the field."""
+    return self._alias
 
   def to_query_field(self) -> str:
     """Converts Field to format 'name AS alias'."""
-    return f'{self.name} AS {self.alias}' if self.alias else self.name
+    return self._query_field
 
   def __str__(self) -> str:
-    return self.to_query_field()
+    return self._query_field
 
   def __repr__(self) -> str:
     return f'Field(name={self.name}, alias={self.alias})'
@@ -105,21 +133,55 @@ class Field:
   def __eq__(self, other: Field) -> bool:
     if not other or not isinstance(other, Field):
       return False
-    return util.remove_spaces(str(self)) == util.remove_spaces(str(other))
+    return self._key == other._key
 
   def __lt__(self, other: Field) -> bool:
-    return util.remove_spaces(str(self)) < util.remove_spaces(str(other))
+    return self._key < other._key
 
   def __gt__(self, other: Field) -> bool:
-    return util.remove_spaces(str(self)) > util.remove_spaces(str(other))
+    return self._key > other._key
 
   def __hash__(self):
-    return hash(
-      (
-        util.remove_spaces(self.name),
-        util.remove_spaces(self.alias if self.alias else ''),
-      )
-    )
+    return self._hash
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_field(name: str, alias: str | None = None) -> Field:
+  """Returns a single shared Field instance for a given name and alias.
+
+  Only used for fields which are never modified after creation (dimensions of
+  built-in collectors), so that identical fields are not duplicated across
+  collectors.
+  """
+  return Field(name=name, alias=alias)
+
+
+_TODAY_FILTER = 'segments.date DURING TODAY'
+_CONVERSION_SPLIT_FILTER = 'metrics.all_conversions > 0'
+_CONVERSION_SPLIT_METRICS = 'all_conversions,all_conversions_value'
+_CONVERSION_SPLIT_DIMENSIONS = (
+  _shared_field('segments.conversion_action_category', 'conversion_category'),
+  _shared_field('segments.conversion_action_name', 'conversion_name'),
+  _shared_field('segments.conversion_action~0', 'conversion_id'),
+)
+_INFO_METRIC = _shared_field('1', 'info')
+
+
+@functools.lru_cache(maxsize=256)
+def _count_days(start_date: str, end_date: str) -> int:
+  """Returns number of days between two dates (both ends included).
+
+  Args:
+    start_date: First day of the period in YYYY-MM-DD format.
+    end_date: Last day of the period in YYYY-MM-DD format.
+
+  Returns:
+    Number of days in the period.
+  """
+  return (
+    datetime.strptime(end_date, '%Y-%m-%d')
+    - datetime.strptime(start_date, '%Y-%m-%d')
+  ).days + 1
 
 
 class CollectorLevel(enum.IntEnum):
@@ -144,7 +206,7 @@ class CollectorLevel(enum.IntEnum):
     return all(key.upper() in cls.__members__ for key in keys)
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True)
 class LevelInfo:
   """Stores meta information for a particular CollectorLevel.
 
@@ -172,7 +234,7 @@ class LevelInfo:
 
   def to_field(self) -> Field:
     """Builds Field from level meta information."""
-    return Field(name=self.id, alias=self.id_alias)
+    return _shared_field(self.id, self.id_alias)
 
 
 _LEVELS = {
@@ -239,8 +301,11 @@ class Collector:
     resource_name: Name of resource to get data from (used in FROM statement).
     query: Full text of the query to be sent to Google Ads API.
     suffix: Optional custom identifier to the collector.
+    is_service: Whether collector only maps entity ids to their names.
   """
 
+  is_service = False
+
   def __init__(
     self,
     name: str | None = None,
@@ -321,14 +386,10 @@ class Collector:
       name=f'{self.name}_conversion_split',
       suffix=self.suffix,
       level=self.level,
-      metrics='all_conversions,all_conversions_value',
-      dimensions=[
-        Field('segments.conversion_action_category', 'conversion_category'),
-        Field('segments.conversion_action_name', 'conversion_name'),
-        Field('segments.conversion_action~0', 'conversion_id'),
-      ],
+      metrics=_CONVERSION_SPLIT_METRICS,
+      dimensions=_CONVERSION_SPLIT_DIMENSIONS,
       resource_name=self.resource_name,
-      filters='metrics.all_conversions > 0',
+      filters=_CONVERSION_SPLIT_FILTER,
     )
 
   @property
@@ -372,12 +433,12 @@ class Collector:
       self._filters = set(self._filters.split(' AND '))
     else:
       self._filters = set(self._filters)
-    if isinstance(self, ServiceCollector) or not self._metrics:
+    if self.is_service or not self._metrics:
       return self._filters
     if not self._filters:
-      self._filters.add('segments.date DURING TODAY')
+      self._filters.add(_TODAY_FILTER)
     elif not any('segments.date' in _filter for _filter in self._filters):
-      self._filters.add('segments.date DURING TODAY')
+      self._filters.add(_TODAY_FILTER)
     return self._filters
 
   @filters.setter
@@ -422,12 +483,13 @@ class Collector:
     if not prefix:
       return set(field_list)
 
+    prefixed_fields = set()
     for field in field_list:
       raw_tokens = util.tokenize(field.name)
-      if not field.alias:
+      if not (alias := field.alias):
         if len(raw_tokens) > 1:
           raise ValueError('virtual column need an alias.')
-        field.alias = field.name
+        alias = field.name
 
       processed_tokens = []
       for value, token_type in raw_tokens:
@@ -436,9 +498,9 @@ class Collector:
           identifier = f'{prefix}.{value}'
         processed_tokens.append(identifier)
 
-      field.name = ' '.join(processed_tokens)
+      prefixed_fields.add(Field(name=' '.join(processed_tokens), alias=alias))
 
-    return set(field_list)
+    return prefixed_fields
 
   @property
   def level_info(self) -> LevelInfo | None:
@@ -468,7 +530,7 @@ class Collector:
     if not (dimensions := self.dimensions):
       return '\n'
     if level_info := self.level_info:
-      dimensions = set(dimensions).difference(set([level_info.to_field()]))
+      dimensions = dimensions - {level_info.to_field()}
     if not dimensions:
       return '\n'
     dimensions_info = ',\n'.join(
@@ -505,6 +567,30 @@ class Collector:
       f'{self.formatted_filters}'
     )
 
+  def clone(self) -> Collector:
+    """Creates a copy of collector which can be changed independently.
+
+    Fields are shared between the copies, while containers holding them
+    are copied.
+
+    Returns:
+      New Collector with the same elements.
+    """
+    cloned = copy.copy(self)
+    cloned._metrics = set(self._metrics)
+    cloned._dimensions = set(self._dimensions)
+    cloned._filters = copy.copy(self._filters)
+    return cloned
+
+  @property
+  def is_customizable(self) -> bool:
+    """Whether query of a collector depends on its elements.
+
+    Collectors created from full query text always return the same query so
+    customizing their elements has no effect.
+    """
+    return not self._query
+
   def customize(self, collector_customization: CollectorCustomization) -> None:
     """Customizes collector elements based on provided customization mapping.
 
@@ -516,6 +602,8 @@ class Collector:
         Provides mapping between names of customized parameter and its updated
         values.
     """
+    if not collector_customization:
+      return
     if level := collector_customization.get('level'):
       self.level = CollectorLevel[level.upper()]
     if (start_date := collector_customization.get('start_date')) and (
@@ -523,16 +611,30 @@ class Collector:
     ):
       start_date = gaarf_utils.convert_date(start_date)
       end_date = gaarf_utils.convert_date(end_date)
-      if not self.filters or 'segments.date DURING TODAY' in self.filters:
-        self.filters.add(
-          f"segments.date BETWEEN '{start_date}' AND '{end_date}'"
-        )
-        self.filters.remove('segments.date DURING TODAY')
-      n_days = (
-        datetime.strptime(end_date, '%Y-%m-%d')
-        - datetime.strptime(start_date, '%Y-%m-%d')
-      ).days + 1
-      self.dimensions.add(Field(str(n_days), 'n_days'))
+      filters = self.filters
+      if not filters or _TODAY_FILTER in filters:
+        filters.discard(_TODAY_FILTER)
+        filters.add(f"segments.date BETWEEN '{start_date}' AND '{end_date}'")
+      n_days = _count_days(start_date, end_date)
+      self.dimensions.add(_shared_field(str(n_days), 'n_days'))
+
+  @property
+  def similarity_key(self) -> tuple:
+    """Identifies a group of similar collectors.
+
+    Two collectors are similar (see `is_similar`) if and only if their
+    similarity keys are equal. Resource names are included into the key only
+    if they are not specific to a CollectorLevel.
+    """
+    resource_name = self.resource_name
+    if CollectorLevel.contains(resource_name):
+      resource_name = None
+    return (
+      resource_name,
+      frozenset(self.metrics),
+      frozenset(self.dimensions),
+      frozenset(self.filters),
+    )
 
   def is_similar(self, other: Collector) -> bool:
     """Compares similarity between two collectors.
@@ -566,7 +668,7 @@ class Collector:
       return False
     if self.level != other.level:
       return False
-    return True
+    return self._query == other._query
 
   def __lt__(self, other: Collector) -> bool:
     """Compares collectors by level values."""
@@ -581,17 +683,27 @@ class Collector:
     return False
 
   def __hash__(self):
-    return hash(self.query)
+    return hash(
+      (
+        self.level,
+        self._query,
+        frozenset(self.metrics),
+        frozenset(self.dimensions),
+        frozenset(self.filters),
+      )
+    )
 
 
 class ServiceCollector(Collector):
   """Helper class for collectors without metrics."""
 
+  is_service = True
+
   @property
   def metrics(self) -> set[Field]:
     """Returns default info metric."""
     return self._metrics or {
-      Field(name='1', alias='info'),
+      _INFO_METRIC,
     }
 
   @metrics.setter
@@ -626,8 +738,8 @@ def create_default_service_collector(level: CollectorLevel) -> ServiceCollector:
     ):
       dimensions.extend(
         [
-          Field(name=level_info.id, alias=level_info.id_alias),
-          Field(name=level_info.name, alias=level_info.name_alias),
+          _shared_field(level_info.id, level_info.id_alias),
+          _shared_field(level_info.name, level_info.name_alias),
         ]
       )
       if filters:
@@ -19,45 +19,157 @@ GaarfReport.
 
 from __future__ import annotations
 
+import gzip
+import http
+import itertools
 import logging
+import operator
+import threading
 import time
-from collections import abc
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
+from typing import Any
 
 import gaarf
 import prometheus_client
+import urllib3
+from prometheus_client import core
 
 logger = logging.getLogger(__name__)
 
-_METRICS = (
-  'campaign.target_cpa.target_cpa_micros',
-  'campaign_budget.amount_micros',
-  'campaign.target_roas.target_roas',
-  'campaign.manual_cpm',
-  'campaign.manual_cpv',
-  'campaign.maximize_conversion_value.target_roas',
-  'campaign.maximize_conversions.target_cpa_micros',
-  'campaign.target_spend.cpc_bid_ceiling_micros',
-  'campaign.target_spend.target_spend_micros',
-  'campaign.target_roas.cpc_bid_ceiling_micros',
-  'campaign.target_roas.cpc_bid_floor_micros',
-  'campaign.target_cpa.cpc_bid_ceiling_micros',
-  'campaign.target_cpa.cpc_bid_floor_micros',
-  'ad_group.cpc_bid_micros',
-  'ad_group.cpm_bid_micros',
-  'ad_group.cpv_bid_micros',
-  'ad_group.effective_target_cpa_micros',
-  'ad_group.effective_target_cpa_source',
-  'ad_group.effective_target_roas',
-  'ad_group.percent_cpc_bid_micros',
-  'ad_group.target_cpa_micros',
-  'ad_group.target_cpm_micros',
-  'ad_group.target_roas',
-  'campaign.optimization_score',
-  'customer.optimization_score',
+_METRICS = frozenset(
+  {
+    'campaign.target_cpa.target_cpa_micros',
+    'campaign_budget.amount_micros',
+    'campaign.target_roas.target_roas',
+    'campaign.manual_cpm',
+    'campaign.manual_cpv',
+    'campaign.maximize_conversion_value.target_roas',
+    'campaign.maximize_conversions.target_cpa_micros',
+    'campaign.target_spend.cpc_bid_ceiling_micros',
+    'campaign.target_spend.target_spend_micros',
+    'campaign.target_roas.cpc_bid_ceiling_micros',
+    'campaign.target_roas.cpc_bid_floor_micros',
+    'campaign.target_cpa.cpc_bid_ceiling_micros',
+    'campaign.target_cpa.cpc_bid_floor_micros',
+    'ad_group.cpc_bid_micros',
+    'ad_group.cpm_bid_micros',
+    'ad_group.cpv_bid_micros',
+    'ad_group.effective_target_cpa_micros',
+    'ad_group.effective_target_cpa_source',
+    'ad_group.effective_target_roas',
+    'ad_group.percent_cpc_bid_micros',
+    'ad_group.target_cpa_micros',
+    'ad_group.target_cpm_micros',
+    'ad_group.target_roas',
+    'campaign.optimization_score',
+    'customer.optimization_score',
+  }
 )
 
 
+def _tuple_getter(
+  positions: Sequence[int],
+) -> Callable[[Sequence[Any]], tuple[Any, ...]]:
+  """Builds a function that extracts values from a sequence as a tuple.
+
+  Unlike plain operator.itemgetter it always returns a tuple, regardless of
+  the number of positions.
+
+  Args:
+    positions: Indices of the values to be extracted.
+
+  Returns:
+    Function that returns values on provided positions.
+  """
+  if not positions:
+    return lambda _: ()
+  if len(positions) == 1:
+    position = positions[0]
+    return lambda data: (data[position],)
+  return operator.itemgetter(*positions)
+
+
+def _column_layout(
+  query_specification: gaarf.query_editor.QueryElements,
+) -> tuple[tuple[str, ...], tuple[str, ...], tuple[str, ...]]:
+  """Identifies columns of the query regardless of its filters and macros.
+
+  Queries with resolved macros (i.e. dates) change over time while their
+  columns stay the same, so only columns are used to cache their metrics.
+
+  Args:
+    query_specification:
+      QuerySpecification that contains all information about the query.
+
+  Returns:
+    Names of columns, fields and virtual columns of the query.
+  """
+  return (
+    tuple(query_specification.column_names),
+    tuple(query_specification.fields),
+    tuple(query_specification.virtual_columns or ()),
+  )
+
+
+class _ReportMetrics(prometheus_client.registry.Collector):
+  """Stores values of metrics exported from reports.
+
+  Values are saved to plain dictionaries and converted to gauges only when
+  registry is collected. Unlike setting a value of Gauge it does not require
+  getting (and locking) a child gauge for each sample.
+
+  Attributes:
+    lock: Lock that guards values of metrics while they are changed.
+  """
+
+  def __init__(self) -> None:
+    """Initializes empty storage of metrics."""
+    self.lock = threading.Lock()
+    self._metrics: dict[
+      str, tuple[str, tuple[str, ...], dict[tuple[str, ...], float]]
+    ] = {}
+
+  def define(
+    self, name: str, documentation: str, labelnames: Sequence[str]
+  ) -> dict[tuple[str, ...], float]:
+    """Gets storage for values of metric creating it if necessary.
+
+    Args:
+      name: Full name of the metric.
+      documentation: Description of the metric.
+      labelnames: Names of labels attached to the metric.
+
+    Returns:
+      Mapping between label values and values of the metric.
+
+    Raises:
+      ValueError: If metric is already defined with different number of labels.
+    """
+    with self.lock:
+      if (metric := self._metrics.get(name)) is None:
+        metric = (documentation, tuple(labelnames), {})
+        self._metrics[name] = metric
+    if len(metric[1]) != len(labelnames):
+      raise ValueError(f'Incorrect label count for metric {name}')
+    return metric[2]
+
+  def clear(self) -> None:
+    """Removes all metrics."""
+    with self.lock:
+      self._metrics.clear()
+
+  def collect(self) -> list[core.GaugeMetricFamily]:
+    """Converts stored values to gauges."""
+    families = []
+    with self.lock:
+      for name, (documentation, labelnames, values) in self._metrics.items():
+        family = core.GaugeMetricFamily(name, documentation, labels=labelnames)
+        for label_values, value in values.items():
+          family.add_metric(label_values, value)
+        families.append(family)
+    return families
+
+
 class GaarfExporter:
   """Exposes reports from Ads API in Prometheus format.
 
@@ -101,6 +213,23 @@ class GaarfExporter:
     self.registry: prometheus_client.CollectorRegistry = (
       prometheus_client.CollectorRegistry()
     )
+    self._report_metrics = _ReportMetrics()
+    self.registry.register(self._report_metrics)
+    self._prepared_columns: dict[tuple, tuple[tuple[str, ...], ...]] = {}
+    self._http_client: urllib3.PoolManager | None = (
+      urllib3.PoolManager(retries=False) if self.pushgateway_url else None
+    )
+    # Disabled once Pushgateway rejects a compressed push.
+    self._compress_pushes = True
+    # Metrics exposed via HTTP server are collected by the server on scrape.
+    self._flush: Callable[[], None] = (
+      self._push_to_gateway if self.pushgateway_url else lambda: None
+    )
+    self._gauges: dict[tuple[str, str, str], prometheus_client.Gauge] = {}
+    self._counters: dict[str, prometheus_client.Counter] = {}
+    self._defined_metrics: dict[
+      tuple[tuple, str, str | None], dict[str, dict[tuple[str, ...], float]]
+    ] = {}
 
   @property
   def export_started(self) -> prometheus_client.Gauge:
@@ -145,8 +274,14 @@ class GaarfExporter:
 
   def reset_registry(self) -> None:
     """Removes all metrics from registry before export."""
-    self.registry._collector_to_names.clear()
-    self.registry._names_to_collectors.clear()
+    for metric in itertools.chain(
+      self._gauges.values(), self._counters.values()
+    ):
+      self.registry.unregister(metric)
+    self._gauges.clear()
+    self._counters.clear()
+    self._report_metrics.clear()
+    self._defined_metrics.clear()
 
   def export(
     self,
@@ -155,6 +290,7 @@ class GaarfExporter:
     suffix: str = '',
     collector: str | None = None,
     account: str | None = None,
+    push: bool = True,
   ) -> None:
     """Exports data from report into the format consumable by Prometheus.
 
@@ -168,6 +304,10 @@ class GaarfExporter:
       suffix: Common identifier to be added to a series of metrics.
       collector: Name of one of GaarfExporter collectors attached to report.
       account: Google Ads account id.
+      push:
+        Whether to push metrics right after export; when exporting many
+        reports it's cheaper to export them with `push=False` and call
+        `flush` once.
     """
     if not report:
       return
@@ -190,22 +330,9 @@ class GaarfExporter:
     metrics = self._define_metrics(
       report.query_specification, suffix, namespace
     )
-    labels = self._define_labels(report.query_specification)
-    for row in report:
-      label_values = []
-      for label in labels:
-        if isinstance(row.get(label), abc.MutableSequence):
-          label_value = ','.join([str(r) for r in row.get(label)])
-        else:
-          label_value = row.get(label)
-        label_values.append(label_value)
-      for name, metric in metrics.items():
-        if (
-          metric_value := getattr(row, name)
-          or self.expose_metrics_with_zero_values
-        ):
-          if not isinstance(metric_value, str):
-            metric.labels(*label_values).set(metric_value)
+    if metrics:
+      labels = self._define_labels(report.query_specification)
+      self._set_metric_values(report, labels, metrics)
     end = time.time()
     export_time_gauge.labels(collector=collector, account=account).set(
       end - start
@@ -216,23 +343,133 @@ class GaarfExporter:
       account,
     )
     api_requests_counter.inc()
-    if self.pushgateway_url:
-      prometheus_client.push_to_gateway(
-        self.pushgateway_url, job=self.job_name, registry=self.registry
-      )
-    else:
-      self.registry.collect()
+    if push:
+      self._flush()
+
+  def flush(self) -> None:
+    """Pushes all exported metrics to Pushgateway if it's used."""
+    self._flush()
+
+  def _push_to_gateway(self) -> None:
+    """Pushes all metrics from registry to Pushgateway."""
+    prometheus_client.push_to_gateway(
+      self.pushgateway_url,
+      job=self.job_name,
+      registry=self.registry,
+      handler=self._pushgateway_handler,
+    )
+
+  def _pushgateway_handler(
+    self,
+    url: str,
+    method: str,
+    timeout: float | None,
+    headers: Sequence[tuple[str, str]],
+    data: bytes,
+  ) -> Callable[[], None]:
+    """Builds handler that sends metrics to Pushgateway.
+
+    Unlike the default handler of prometheus_client metrics are sent gzip
+    compressed. Pushgateway versions without gzip support (before v1.5.0)
+    reject such pushes with a client error, in which case the push is
+    repeated uncompressed and compression is no longer used.
+
+    Args:
+      url: Address of Pushgateway with job and grouping key.
+      method: HTTP method of the request.
+      timeout: Request timeout in seconds.
+      headers: Headers of the request.
+      data: Metrics in Prometheus text format.
+
+    Returns:
+      Function that performs the request.
+    """
+
+    def handle() -> None:
+      response = None
+      if self._compress_pushes:
+        response = self._http_client.request(
+          method,
+          url,
+          body=gzip.compress(data, compresslevel=1),
+          headers={**dict(headers), 'Content-Encoding': 'gzip'},
+          timeout=timeout,
+        )
+        if (
+          http.HTTPStatus.BAD_REQUEST
+          <= response.status
+          < http.HTTPStatus.INTERNAL_SERVER_ERROR
+        ):
+          self._compress_pushes = False
+          response = None
+      if response is None:
+        response = self._http_client.request(
+          method, url, body=data, headers=dict(headers), timeout=timeout
+        )
+      if response.status >= http.HTTPStatus.BAD_REQUEST:
+        raise OSError(
+          'error talking to pushgateway: '
+          f'{response.status} {response.reason}'
+        )
+
+    return handle
+
+  def _set_metric_values(
+    self,
+    report: gaarf.report.GaarfReport,
+    labels: Sequence[str],
+    metrics: dict[str, dict[tuple[str, ...], float]],
+  ) -> None:
+    """Sets values of metrics for each row of the report.
+
+    Rows are read directly from report results to avoid creating GaarfRow
+    for each of them; reports with placeholder results have no rows.
+
+    Args:
+      report: Report with Google Ads data.
+      labels: Names of report columns attached to metrics as labels.
+      metrics: Mapping between metrics alias in report and values of the metric.
+    """
+    if report.results_placeholder:
+      return
+    expose_metrics_with_zero_values = self.expose_metrics_with_zero_values
+    column_names = report.column_names
+    get_label_values = _tuple_getter(
+      [column_names.index(label) for label in labels]
+    )
+    get_metric_values = _tuple_getter(
+      [column_names.index(name) for name in metrics]
+    )
+    metric_values = list(metrics.values())
+    with self._report_metrics.lock:
+      for row in report.results:
+        label_values = tuple(
+          [
+            ','.join(map(str, label_value))
+            if isinstance(label_value, list)
+            else str(label_value)
+            for label_value in get_label_values(row)
+          ]
+        )
+        for values, value in zip(metric_values, get_metric_values(row)):
+          if (value or expose_metrics_with_zero_values) and not isinstance(
+            value, str
+          ):
+            values[label_values] = float(value or 0)
 
   def _define_metrics(
     self,
     query_specification: gaarf.query_editor.QuerySpecification,
     suffix: str,
     namespace: str,
-  ) -> dict[str, prometheus_client.Gauge]:
+  ) -> dict[str, dict[tuple[str, ...], float]]:
     """Defines metrics to be exposed Prometheus.
 
     Metrics are defined based on query_specification of report that needs to
     be exposed. It takes into account both virtual and non-virtual columns.
+    Defined metrics are reused for reports with the same columns until
+    registry is reset. Metric names follow the same structure as names of
+    gauges (see `_define_gauge`).
 
     Args:
       query_specification:
@@ -241,18 +478,20 @@ class GaarfExporter:
       namespace: Global prefix for all Prometheus metrics.
 
     Returns:
-      Mapping between metrics alias in report and Gauge.
+      Mapping between metrics alias in report and values of the metric.
     """
-    metrics = {}
-    labels = self._define_labels(query_specification)
-    non_virtual_columns = self._get_non_virtual_columns(query_specification)
-    for column, field in zip(non_virtual_columns, query_specification.fields):
-      if 'metrics' in field or field in _METRICS:
-        metrics[column] = self._define_gauge(column, suffix, labels, namespace)
-    if virtual_columns := query_specification.virtual_columns:
-      for column, field in virtual_columns.items():
-        metrics[column] = self._define_gauge(column, suffix, labels, namespace)
+    key = (_column_layout(query_specification), suffix, namespace)
+    if (metrics := self._defined_metrics.get(key)) is not None:
+      return metrics
+    labels, metric_columns = self._prepare(query_specification)
+    metrics = {
+      column: self._report_metrics.define(
+        self._format_metric_name(column, suffix, namespace), column, labels
+      )
+      for column in metric_columns
+    }
     logger.debug('metrics: %s', metrics)
+    self._defined_metrics[key] = metrics
     return metrics
 
   def _define_labels(
@@ -271,13 +510,42 @@ class GaarfExporter:
     Returns:
       All possible labels names that can be attached to metrics.
     """
+    labelnames, _ = self._prepare(query_specification)
+    logger.debug('labelnames: %s', labelnames)
+    return labelnames
+
+  def _prepare(
+    self, query_specification: gaarf.query_editor.QuerySpecification
+  ) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """Splits columns of the query into labels and metrics.
+
+    Columns are classified in a single pass and the result is saved for
+    the columns of the query, so reports with the same columns (i.e. for
+    different accounts or dates) are not classified again.
+
+    Args:
+      query_specification:
+        QuerySpecification that contains all information about the query.
+
+    Returns:
+      Names of labels and names of metric columns.
+    """
+    column_layout = _column_layout(query_specification)
+    if prepared := self._prepared_columns.get(column_layout):
+      return prepared
     labelnames = []
+    metric_columns = []
     non_virtual_columns = self._get_non_virtual_columns(query_specification)
     for column, field in zip(non_virtual_columns, query_specification.fields):
-      if 'metric' not in field and field not in _METRICS:
+      if field.startswith('metrics.') or field in _METRICS:
+        metric_columns.append(column)
+      else:
         labelnames.append(str(column))
-    logger.debug('labelnames: %s', labelnames)
-    return labelnames
+    if virtual_columns := query_specification.virtual_columns:
+      metric_columns.extend(virtual_columns)
+    prepared = tuple(labelnames), tuple(metric_columns)
+    self._prepared_columns[column_layout] = prepared
+    return prepared
 
   def _define_gauge(
     self,
@@ -304,18 +572,39 @@ class GaarfExporter:
     """
     if not namespace:
       namespace = self.namespace
-    if suffix and suffix != 'Remove':
-      gauge_name = f'{namespace}_{suffix}_{name}'
-    else:
-      gauge_name = f'{namespace}_{name}'
-    if gauge_name in self.registry._names_to_collectors:
-      return self.registry._names_to_collectors.get(gauge_name)
-    return prometheus_client.Gauge(
+    if suffix == 'Remove':
+      suffix = ''
+    key = (namespace, suffix, name)
+    if (gauge := self._gauges.get(key)) is not None:
+      return gauge
+    gauge_name = self._format_metric_name(name, suffix, namespace)
+    gauge = prometheus_client.Gauge(
       name=gauge_name,
       documentation=name,
       labelnames=labelnames,
       registry=self.registry,
     )
+    self._gauges[key] = gauge
+    return gauge
+
+  def _format_metric_name(
+    self, name: str, suffix: str, namespace: str | None = None
+  ) -> str:
+    """Builds name of metric in '<namespace>_<suffix>_<name>' format.
+
+    Args:
+      name: Name of the metric to be exposed to Prometheus (without prefix).
+      suffix: Common identifier to be added to a series of metrics.
+      namespace: Global prefix for all Prometheus metrics.
+
+    Returns:
+      Full name of the metric.
+    """
+    if not namespace:
+      namespace = self.namespace
+    if suffix and suffix != 'Remove':
+      return f'{namespace}_{suffix}_{name}'
+    return f'{namespace}_{name}'
 
   def _define_counter(self, name: str) -> prometheus_client.Counter:
     """Define Counter metric based on provided name.
@@ -326,11 +615,13 @@ class GaarfExporter:
       An instance of Counter that associated with registry.
     """
     counter_name = f'gaarf_{name}'
-    if counter_name in self.registry._names_to_collectors:
-      return self.registry._names_to_collectors.get(counter_name)
-    return prometheus_client.Counter(
+    if (counter := self._counters.get(counter_name)) is not None:
+      return counter
+    counter = prometheus_client.Counter(
       name=counter_name, documentation=name, registry=self.registry
     )
+    self._counters[counter_name] = counter
+    return counter
 
   def _get_non_virtual_columns(
     self, query_specification: gaarf.query_editor.QuerySpecification
@@ -347,10 +638,11 @@ class GaarfExporter:
     Returns:
       All columns from the query that are not virtual.
     """
+    virtual_columns = query_specification.virtual_columns or {}
     return [
       column
       for column in query_specification.column_names
-      if column not in query_specification.virtual_columns
+      if column not in virtual_columns
     ]
 
   def __str__(self) -> str:
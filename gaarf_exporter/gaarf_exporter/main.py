@@ -20,16 +20,23 @@ and expose them to Prometheus.
 from __future__ import annotations
 
 import argparse
+import signal
 from concurrent import futures
-from time import sleep, time
+from time import monotonic, sleep, time
 
 import prometheus_client
+from gaarf import query_editor
 from gaarf.cli import utils as gaarf_utils
 
 from gaarf_exporter import bootstrap, exporter, registry
 
+# Used when there is no delay between exports, so that accounts under MCC are
+# not expanded with a separate API call on every iteration.
+_MIN_ACCOUNTS_UPDATE_INTERVAL_SECONDS = 60 * 60
 
-def main() -> None:
+
+def _build_parser() -> argparse.ArgumentParser:
+  """Builds parser for command line arguments of gaarf-exporter."""
   parser = argparse.ArgumentParser()
   parser.add_argument('--account', dest='account', default=None)
   parser.add_argument('-c', '--config', dest='config', default=None)
@@ -61,7 +68,7 @@ def main() -> None:
     action='store_true',
   )
   parser.add_argument('--namespace', dest='namespace', default='googleads')
-  parser.add_argument('--max-parallel', dest='parallel', default=None)
+  parser.add_argument('--max-parallel', dest='parallel', default=None, type=int)
   parser.add_argument(
     '--fetching-timeout-seconds', dest='fetching_timeout', default=120, type=int
   )
@@ -74,6 +81,42 @@ def main() -> None:
   )
   parser.set_defaults(deduplicate=True)
   parser.set_defaults(service_collectors=True)
+  return parser
+
+
+def block_export_requests() -> None:
+  """Blocks SIGHUP so that it is only received by `wait_for_export_request`.
+
+  Threads inherit the signal mask of the thread that starts them, so this
+  should be called before any thread is started; otherwise SIGHUP can be
+  delivered to a thread which does not wait for it and stop the exporter.
+  """
+  if hasattr(signal, 'sigtimedwait'):
+    signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGHUP})
+
+
+def wait_for_export_request(timeout: float) -> bool:
+  """Waits until the next export is requested with SIGHUP.
+
+  SIGHUP is taken from pending signals instead of being handled by a signal
+  handler, so no lock can be acquired in the middle of the waiting.
+
+  Args:
+    timeout: Maximum time to wait in seconds.
+
+  Returns:
+    Whether the export was requested before the timeout.
+  """
+  if not hasattr(signal, 'sigtimedwait'):
+    sleep(timeout)
+    return False
+  return signal.sigtimedwait({signal.SIGHUP}, timeout) is not None
+
+
+def main() -> None:
+  # SIGHUP interrupts waiting between exports and starts a new export.
+  block_export_requests()
+  parser = _build_parser()
   args_bag = parser.parse_known_args()
   args = args_bag[0]
 
@@ -85,7 +128,13 @@ def main() -> None:
 
   params = gaarf_utils.ParamsParser(['macro']).parse(args_bag[1]).get('macro')
 
-  active_collectors = registry.initialize_collectors(
+  executor = futures.ThreadPoolExecutor(
+    max_workers=args.parallel or None, thread_name_prefix='gaarf-exporter'
+  )
+  # Collectors are built while dependencies (i.e. accounts under MCC) are
+  # fetched from Google Ads API.
+  active_collectors_future = executor.submit(
+    registry.initialize_collectors,
     config_file=args.config,
     collector_names=args.collectors,
     create_service_collectors=args.service_collectors,
@@ -97,6 +146,9 @@ def main() -> None:
     api_version=args.api_version,
     account=args.account,
   )
+  active_collectors = active_collectors_future.result()
+  if not args.config and params:
+    active_collectors.customize(params)
   report_fetcher, accounts = (
     dependencies.get('report_fetcher'),
     dependencies.get('accounts'),
@@ -128,51 +180,80 @@ def main() -> None:
     logger.info(
       'Started http_server at http://%s', gaarf_exporter.http_server_url
     )
+  # Exports are scheduled at fixed intervals regardless of their duration.
+  next_export_time = monotonic()
+  # Accounts are updated once per N iterations' worth of time, so that a
+  # slow export does not postpone the update.
+  accounts_update_interval = (
+    args.iterations_left * args.delay * 60
+    or _MIN_ACCOUNTS_UPDATE_INTERVAL_SECONDS
+  )
+  next_accounts_update_time = next_export_time + accounts_update_interval
   while True:
-    if iterations_left := args.iterations_left:
-      iterations_left -= 1
-    if accounts and iterations_left == 0:
+    if accounts and monotonic() >= next_accounts_update_time:
       accounts = report_fetcher.expand_mcc(args.account)
-      iterations_left = args.iterations_left
+      next_accounts_update_time = monotonic() + accounts_update_interval
     logger.info('Beginning export')
     start_export_time = time()
     gaarf_exporter.export_started.set(start_export_time)
-    if not args.config and params:
-      active_collectors.customize(params)
-    for key, value in params.items():
-      params[key] = gaarf_utils.convert_date(value)
+    # Macros are resolved on each iteration so that relative dates stay fresh.
+    resolved_params = {
+      key: gaarf_utils.convert_date(value) for key, value in params.items()
+    }
+    collector_queries = {}
     for collector in active_collectors:
       if not (query_text := collector.query):
         raise ValueError(f'Missing query text for query "{collector.name}"')
-      if params:
-        query_text = query_text.format(**params)
+      if resolved_params:
+        query_text = query_text.format(**resolved_params)
+      # Query is parsed once per collector instead of once per account.
+      query_specification = query_editor.QuerySpecification(
+        text=query_text, api_version=report_fetcher.api_client.api_version
+      ).generate()
       if not accounts:
-        report = report_fetcher.fetch(query_text, accounts)
+        report = report_fetcher.fetch(query_specification, accounts)
       else:
-        max_workers = int(args.parallel) if args.parallel else None
-        with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-          future_to_account = {
-            executor.submit(report_fetcher.fetch, query_text, account): account
-            for account in accounts
-          }
-          for future in futures.as_completed(
-            future_to_account, timeout=args.fetching_timeout
-          ):
-            account = future_to_account[future]
-            start = time()
-            report = future.result()
-            end = time()
-            gaarf_exporter.report_fetcher_gauge.labels(
-              collector=collector.name, account=account
-            ).set(end - start)
-            if dependencies.get('convert_fake_report'):
-              report.is_fake = False
-            gaarf_exporter.export(
-              report=report,
-              suffix=collector.suffix,
-              collector=collector.name,
-              account=account,
-            )
+        collector_queries[collector] = query_specification
+    if collector_queries:
+      future_to_target = {
+        executor.submit(report_fetcher.fetch, query_specification, account): (
+          collector,
+          account,
+        )
+        for collector, query_specification in collector_queries.items()
+        for account in accounts
+      }
+      # Fetching timeout is applied per collector, as with sequential fetching.
+      try:
+        for future in futures.as_completed(
+          future_to_target,
+          timeout=args.fetching_timeout * len(collector_queries),
+        ):
+          # Futures keep their reports, so exported ones are released right
+          # away instead of at the end of the iteration.
+          collector, account = future_to_target.pop(future)
+          start = time()
+          report = future.result()
+          end = time()
+          gaarf_exporter.report_fetcher_gauge.labels(
+            collector=collector.name, account=account
+          ).set(end - start)
+          if dependencies.get('convert_fake_report'):
+            report.is_fake = False
+          gaarf_exporter.export(
+            report=report,
+            suffix=collector.suffix,
+            collector=collector.name,
+            account=account,
+            push=False,
+          )
+      except futures.TimeoutError:
+        # Unfinished fetches should not pile up in the pool with the ones
+        # submitted on the next iteration.
+        cancelled = sum(future.cancel() for future in future_to_target)
+        logger.warning(
+          'Fetching timed out, %d pending fetches were cancelled', cancelled
+        )
     logger.info('Export completed')
     end_export_time = time()
     gaarf_exporter.export_completed.set(end_export_time)
@@ -185,8 +266,16 @@ def main() -> None:
       logger.info(
         'Saving data to pushgateway at %s', gaarf_exporter.pushgateway_url
       )
+      gaarf_exporter.flush()
       exit()
-    sleep(int(args.delay) * 60)
+    next_export_time += args.delay * 60
+    if (delay := next_export_time - monotonic()) > 0:
+      if wait_for_export_request(delay):
+        next_export_time = monotonic()
+    else:
+      if args.delay > 0:
+        logger.warning('Export took longer than %d minutes', args.delay)
+      next_export_time = monotonic()
     if iterations := args.iterations:
       iterations -= 1
       if iterations == 0:
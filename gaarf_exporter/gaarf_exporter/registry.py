@@ -17,7 +17,7 @@ Collectors are converted to gaarf queries that are sent to Ads API.
 
 from __future__ import annotations
 
-import itertools
+import functools
 import logging
 import os
 import pathlib
@@ -29,6 +29,9 @@ import yaml
 from gaarf_exporter import collector as query_collector
 
 _SCRIPT_DIR = pathlib.Path(__file__).parent
+_BUILTIN_DEFINITIONS = _SCRIPT_DIR / 'collector_definitions'
+_EMPTY: frozenset = frozenset()
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 
 
 class Registry:
@@ -38,11 +41,44 @@ class Registry:
 
   Attributes:
     collectors: Mapping between collector names and corresponding class.
+    subregistries: Mapping between sub-registry names and names of collectors
+      included in them.
   """
 
-  def __init__(self, collectors: dict | None = None) -> None:
-    """Creates Registry based on module level variable _REGISTRY."""
-    self.collectors = dict(collectors) or dict()
+  def __init__(
+    self,
+    collectors: dict | None = None,
+    subregistries: dict[str, set[str]] | None = None,
+  ) -> None:
+    """Creates Registry from collectors and optional sub-registries.
+
+    Args:
+      collectors:
+        Mapping between collector names and collectors. For backward
+        compatibility a value can also be a mapping of collectors; such
+        entries are treated as sub-registries.
+      subregistries:
+        Mapping between sub-registry names and names of collectors in them.
+    """
+    self.collectors: dict[str, query_collector.Collector] = {}
+    self.subregistries: dict[str, set[str]] = {
+      name: set(collector_names)
+      for name, collector_names in (subregistries or {}).items()
+    }
+    for name, collector in (collectors or {}).items():
+      if isinstance(collector, dict):
+        self.subregistries.setdefault(name, set()).update(collector)
+        self.collectors.update(collector)
+      else:
+        self.collectors[name] = collector
+    self._index: dict[str, frozenset[query_collector.Collector]] = {
+      name: frozenset((collector,))
+      for name, collector in self.collectors.items()
+    }
+    for name, collector_names in self.subregistries.items():
+      self._index[name] = frozenset(
+        self.collectors[collector_name] for collector_name in collector_names
+      )
 
   @classmethod
   def from_collector_definitions(
@@ -58,8 +94,12 @@ class Registry:
     Returns:
       Initialized collector registry.
     """
-    collectors: dict = defaultdict(dict)
-    results = _load_collector_data(path_to_definitions)
+    collectors: dict[str, query_collector.Collector] = {}
+    subregistries: dict[str, set[str]] = defaultdict(set)
+    if pathlib.Path(path_to_definitions) == _BUILTIN_DEFINITIONS:
+      results = _load_builtin_collector_data()
+    else:
+      results = _load_collector_data(path_to_definitions)
     for data in results:
       for collector_data in data:
         if collector_data.get('type') == 'service' or collector_data.get(
@@ -71,39 +111,48 @@ class Registry:
         else:
           coll = query_collector.Collector.from_definition(collector_data)
         collectors[coll.name] = coll
-        if subregistries := collector_data.get('registries'):
-          for subregistry in subregistries:
-            collectors[subregistry].update({coll.name: coll})
+        for subregistry in collector_data.get('registries') or []:
+          subregistries[subregistry].add(coll.name)
         if 'has_conversion_split' in collector_data:
           conv_coll = coll.create_conversion_split_collector()
           collectors[conv_coll.name] = conv_coll
-    return cls(collectors)
+    return cls(collectors, subregistries)
 
   @property
   def default_collectors(self) -> CollectorSet:
     """Helper for getting only default collectors from the registry."""
-    return CollectorSet(collectors=set(self.collectors.get('default').values()))
+    return CollectorSet(collectors=set(self._index.get('default', _EMPTY)))
 
   @property
   def all_subregistries(self) -> CollectorSet:
     """Helper for getting only sub-registries."""
-    collector_names = set()
-    for name, collector in self.collectors.items():
-      if isinstance(collector, dict):
-        collector_names.add(name)
-    subregistries_collector_names = ','.join(collector_names)
-    return self.find_collectors(collector_names=subregistries_collector_names)
+    return CollectorSet(collectors=set(self._subregistries_collectors))
 
   @property
   def all_collectors(self) -> CollectorSet:
     """Helper for getting all collectors from the registry."""
-    all_collector_names = ','.join(self.collectors.keys())
-    return self.find_collectors(
-      collector_names=all_collector_names,
+    return CollectorSet(
+      collectors=set(self._all_collectors),
       deduplicate=False,
       service_collectors=False,
     )
 
+  @functools.cached_property
+  def _subregistries_collectors(self) -> frozenset[query_collector.Collector]:
+    """Collectors from all sub-registries.
+
+    Only immutable sets are cached so that each CollectorSet returned by
+    Registry can be changed independently.
+    """
+    return frozenset().union(
+      *(self._index[name] for name in self.subregistries)
+    )
+
+  @functools.cached_property
+  def _all_collectors(self) -> frozenset[query_collector.Collector]:
+    """All collectors from the registry."""
+    return frozenset().union(*self._index.values())
+
   def find_collectors(
     self,
     collector_names: str | None = None,
@@ -126,20 +175,12 @@ class Registry:
       return CollectorSet()
     if collector_names == 'all':
       return self.all_collectors
-    collectors_subset = [
-      collector
-      for name, collector in self.collectors.items()
-      if name in collector_names.strip().split(',')
-    ]
-    found_collectors = set()
-    for collector in collectors_subset:
-      if isinstance(collector, dict):
-        for collector_ in collector.values():
-          found_collectors.add(collector_)
-      else:
-        found_collectors.add(collector)
+    wanted = frozenset(name.strip() for name in collector_names.split(','))
+    found_collectors = set().union(
+      *(self._index[name] for name in self._index.keys() & wanted)
+    )
     return CollectorSet(
-      collectors=set(found_collectors),
+      collectors=found_collectors,
       deduplicate=deduplicate,
       service_collectors=service_collectors,
     )
@@ -164,9 +205,10 @@ class CollectorSet(MutableSet):
       deduplicate:
         Whether to perform deduplication of collectors in the set.
     """
-    self._collectors = collectors or set()
+    self._collectors = collectors if collectors else _EMPTY
     self._service_collectors = service_collectors
     self._deduplicate = deduplicate
+    self._resolved_collectors: set[query_collector.Collector] | None = None
 
   @property
   def collectors(self) -> set[query_collector.Collector]:
@@ -177,56 +219,79 @@ class CollectorSet(MutableSet):
     data twice is wasteful so we leave only collectors with the lowest level.
     If needed the default service collector is generated at the lowest level
     (i.e. ad_group) to ensure proper mapping between ids and names of entities.
+    Resolved collectors are cached until the set is changed.
     """
+    if self._resolved_collectors is not None:
+      return self._resolved_collectors
     if self._deduplicate:
       self.deduplicate_collectors()
     if self._service_collectors:
-      has_service_collector = any(
-        [
-          isinstance(collector, query_collector.ServiceCollector)
-          for collector in self._collectors
-        ]
-      )
-      if not has_service_collector:
-        valid_collector_levels = [
-          collector.level
-          for collector in self._collectors
-          if collector.level != query_collector.CollectorLevel.UNKNOWN
-        ]
-        if valid_collector_levels:
-          default_service_collector = (
-            query_collector.create_default_service_collector(
-              min(valid_collector_levels)
-            )
+      lowest_level = None
+      for collector in self._collectors:
+        if collector.is_service:
+          break
+        level = collector.level
+        if level != query_collector.CollectorLevel.UNKNOWN and (
+          lowest_level is None or level < lowest_level
+        ):
+          lowest_level = level
+      else:
+        if lowest_level is not None:
+          self._collectors.add(
+            query_collector.create_default_service_collector(lowest_level)
           )
-          self._collectors.add(default_service_collector)
 
+    self._resolved_collectors = self._collectors
     return self._collectors
 
   def deduplicate_collectors(self) -> None:
     """Deduplicates collectors in the set.
 
     If there are similar collectors in the list return only those with
-    the lowest level.
+    the lowest level. Collectors are grouped by their similarity keys in a
+    single pass instead of comparing each pair of collectors.
     """
-    combinations = itertools.combinations(self._collectors, 2)
-    for collector_1, collector_2 in combinations:
-      if collector_1.is_similar(collector_2):
-        max_collector = max(collector_1, collector_2)
-        self._collectors.remove(max_collector)
+    lowest_level_collectors: dict[tuple, query_collector.Collector] = {}
+    duplicates = []
+    for collector in self._collectors:
+      key = collector.similarity_key
+      if (seen_collector := lowest_level_collectors.get(key)) is None:
+        lowest_level_collectors[key] = collector
+      elif collector < seen_collector:
+        lowest_level_collectors[key] = collector
+        duplicates.append(seen_collector)
+      else:
+        duplicates.append(collector)
+    for duplicate in duplicates:
+      self._collectors.discard(duplicate)
 
   def customize(
     self, collector_customization: query_collector.CollectorCustomization
   ) -> None:
     """Changes collectors in the set based on provided arguments mapping.
 
+    Collectors are customized on their copies so that the same collectors
+    stored in Registry (or in other sets) remain unchanged.
+
     Args:
       collector_customization:
         Mapping between name and values of elements in collector to be
         customized.
     """
-    for collector in self.collectors:
-      collector.customize(collector_customization)
+    if not collector_customization or self._collectors is _EMPTY:
+      return
+    if not any(collector.is_customizable for collector in self.collectors):
+      return
+    customized_collectors = set()
+    for collector in self._collectors:
+      if collector.is_customizable:
+        customized_collector = collector.clone()
+        customized_collector.customize(collector_customization)
+        customized_collectors.add(customized_collector)
+      else:
+        customized_collectors.add(collector)
+    self._collectors = customized_collectors
+    self._resolved_collectors = None
 
   def __bool__(self):
     return bool(self.collectors)
@@ -244,10 +309,15 @@ class CollectorSet(MutableSet):
     return len(self.collectors)
 
   def add(self, collector) -> None:
+    if self._collectors is _EMPTY:
+      self._collectors = set()
     self._collectors.add(collector)
+    self._resolved_collectors = None
 
   def discard(self, collector) -> None:
-    self._collectors.discard(collector)
+    if self._collectors is not _EMPTY:
+      self._collectors.discard(collector)
+      self._resolved_collectors = None
 
 
 def initialize_collectors(
@@ -290,6 +360,22 @@ def initialize_collectors(
   raise ValueError('Neither collector_file nor collector_names were provided')
 
 
+@functools.lru_cache(maxsize=1)
+def _load_builtin_collector_data() -> (
+  tuple[list[query_collector.CollectorDefinition], ...]
+):
+  """Loads collector definitions shipped with the package only once.
+
+  Built-in definitions cannot change while the process is running so there's
+  no need to parse them each time a Registry is built.
+  Returned definitions are shared and should be treated as read-only.
+
+  Returns:
+    Loaded built-in collector definitions.
+  """
+  return tuple(_load_collector_data(_BUILTIN_DEFINITIONS))
+
+
 def _load_collector_data(
   path_to_definitions: str | os.Pathlike,
 ) -> list[query_collector.CollectorDefinition]:
@@ -305,10 +391,10 @@ def _load_collector_data(
   results = []
   if path_to_definitions.is_file():
     with open(path_to_definitions, 'r', encoding='utf-8') as f:
-      results.append(yaml.safe_load(f))
+      results.append(yaml.load(f, Loader=_YAML_LOADER))
   else:
     for file in path_to_definitions.iterdir():
       if file.suffix == '.yaml':
         with open(file, 'r', encoding='utf-8') as f:
-          results.append(yaml.safe_load(f))
+          results.append(yaml.load(f, Loader=_YAML_LOADER))
   return results
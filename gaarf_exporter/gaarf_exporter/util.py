@@ -17,7 +17,7 @@ from __future__ import annotations
 
 import re
 
-_TOKEN_PATTERNS = (
+_TOKEN_PATTERNS = re.compile(
   r'(?i)(?P<INDEX>~\d+)'
   r'|(?P<NESTED_RESOURCE>:(\w+\.)+\w+)'
   r'|(?P<STRING>".*?")'
@@ -31,17 +31,20 @@ _TOKEN_PATTERNS = (
   r'|(?P<MATH_OPERATOR>((\>\=)|(\<\=))|([\+\-\*/\(\)\=\>\<]))'
 )
 
-_RELATIVE_METRIC_PATTERNS = r'(?i)average_|_cpm|ctr|_percentage|_rate|_share'
+_RELATIVE_METRIC_PATTERNS = re.compile(
+  r'(?i)average_|_cpm|ctr|_percentage|_rate|_share'
+)
+_WHITESPACES = re.compile(r'\s+')
 
 
 def remove_spaces(s) -> str:
-  return re.sub(r'\s+', '', s)
+  return _WHITESPACES.sub('', s)
 
 
 def tokenize(expression) -> list[tuple[str, str | None]]:
   tokens = []
   prev_token_type = None
-  for match in re.finditer(_TOKEN_PATTERNS, expression):
+  for match in _TOKEN_PATTERNS.finditer(expression):
     token_type = match.lastgroup
     token_value = match.group()
     tokens.append(
@@ -60,6 +63,6 @@ def find_relative_metrics(query) -> list[str]:
 
     if token_type in ('IDENTIFIER', 'PREFIXED_IDENTIFIER'):
       metric_name = token_value.split('.')[-1]
-      if re.search(_RELATIVE_METRIC_PATTERNS, metric_name):
+      if _RELATIVE_METRIC_PATTERNS.search(metric_name):
         result.add(metric_name)
   return list(result)
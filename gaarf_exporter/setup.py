@@ -47,6 +47,7 @@ setup(
   install_requires=[
     'prometheus-client',
     'google-ads-api-report-fetcher==1.14.0',
+    'urllib3',
   ],
   setup_requires=['pytest-runner'],
   tests_requires=['pytest'],
@@ -89,6 +89,34 @@ class TestCollector:
     )
     assert conv_split_collector == expected_collector
 
+  def test_customize_with_date_range_adds_n_days_dimension(self):
+    collector = query_collector.Collector(name='test', metrics='clicks')
+    collector.customize({'start_date': '2024-01-01', 'end_date': '2024-01-07'})
+
+    assert query_collector.Field('7', 'n_days') in collector.dimensions
+    assert collector.filters == {
+      "segments.date BETWEEN '2024-01-01' AND '2024-01-07'"
+    }
+
+  def test_clone_creates_independent_collector(self):
+    collector = query_collector.Collector(name='test', metrics='clicks')
+    cloned_collector = collector.clone()
+    cloned_collector.customize(
+      {'start_date': '2024-01-01', 'end_date': '2024-01-07'}
+    )
+
+    assert cloned_collector.query != collector.query
+    assert collector.filters == {'segments.date DURING TODAY'}
+
+  def test_init_does_not_change_provided_metrics(self):
+    metric = query_collector.Field('clicks')
+    collector = query_collector.Collector(name='test', metrics=[metric])
+
+    assert metric.name == 'clicks'
+    assert collector.metrics == {
+      query_collector.Field('metrics.clicks', 'clicks')
+    }
+
   class TestCollectorQuery:
     def test_simple_collector_creates_correct_query(self):
       collector = query_collector.Collector(
@@ -607,6 +635,17 @@ class TestCollector:
 
       assert collector1 == collector2
 
+    def test_collectors_with_different_queries_are_not_equal(self):
+      collector1 = query_collector.Collector(
+        name='collector1', query='SELECT campaign.id FROM campaign'
+      )
+      collector2 = query_collector.Collector(
+        name='collector2', query='SELECT ad_group.id FROM ad_group'
+      )
+
+      assert collector1 != collector2
+      assert collector2 not in {collector1}
+
     def test_collectors_with_different_order_of_metrics_are_equal(self):
       collector1 = query_collector.Collector(
         metrics=[
@@ -747,3 +786,13 @@ def test_collectors_similarity_check_returns_deduplicated_collectors(
 ):
   actual = query_collector.collectors_similarity_check(collectors)
   assert set([t.name for t in actual]) == set(expected)
+
+
+def test_field_cannot_be_changed_after_creation():
+  field = query_collector.Field('campaign.id', 'campaign_id')
+
+  with pytest.raises(AttributeError):
+    field.alias = 'id'
+  with pytest.raises(AttributeError):
+    field.name = 'ad_group.id'
+  assert str(field) == 'campaign.id AS campaign_id'
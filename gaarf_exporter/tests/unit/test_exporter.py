@@ -13,13 +13,35 @@
 # limitations under the License.
 from __future__ import annotations
 
+import dataclasses
+import gzip
+
 import pytest
+import urllib3
 from gaarf.query_editor import QuerySpecification
 from gaarf.report import GaarfReport
 from gaarf_exporter.exporter import GaarfExporter
 from prometheus_client import samples
 
 
+@dataclasses.dataclass
+class FakeResponse:
+  status: int
+  reason: str = ''
+
+
+class FakePoolManager:
+  """Records requests and replies with predefined statuses."""
+
+  def __init__(self, *statuses: int) -> None:
+    self.statuses = list(statuses)
+    self.requests = []
+
+  def request(self, method, url, **kwargs):
+    self.requests.append({'method': method, 'url': url, **kwargs})
+    return FakeResponse(status=self.statuses.pop(0))
+
+
 class TestGaaarfExporter:
   @pytest.fixture
   def gaarf_exporter(self):
@@ -78,6 +100,16 @@ class TestGaaarfExporter:
     metrics = list(gaarf_exporter.registry.collect())
     assert f'{namespace}_{suffix}_clicks' in [metric.name for metric in metrics]
 
+  def test_export_of_same_report_with_different_suffixes_returns_all_metrics(
+    self, gaarf_exporter, report
+  ):
+    gaarf_exporter.export(report=report, suffix='first')
+    gaarf_exporter.export(report=report, suffix='second')
+    metrics = [metric.name for metric in gaarf_exporter.registry.collect()]
+
+    assert 'googleads_first_clicks' in metrics
+    assert 'googleads_second_clicks' in metrics
+
   def test_export_returns_correct_virtual_metric_name(
     self, gaarf_exporter, report_with_virtual_column
   ):
@@ -121,6 +153,140 @@ class TestGaaarfExporter:
       if metric.name == 'googleads_clicks':
         assert metric.samples == expected_samples
 
+  def test_export_splits_columns_into_labels_and_metrics(
+    self, gaarf_exporter, report, report_with_virtual_column
+  ):
+    gaarf_exporter.export(report)
+    gaarf_exporter.export(report_with_virtual_column)
+    labels_by_metric = {
+      metric.name: [sample.labels for sample in metric.samples]
+      for metric in gaarf_exporter.registry.collect()
+    }
+
+    assert 'googleads_campaign_id' not in labels_by_metric
+    assert labels_by_metric['googleads_clicks'] == [
+      {'campaign_id': '1'},
+      {'campaign_id': '2'},
+    ]
+    assert labels_by_metric['googleads_info'] == [
+      {'campaign_id': '1'},
+      {'campaign_id': '2'},
+    ]
+
+  def test_export_of_queries_with_same_columns_does_not_duplicate_metrics(
+    self, gaarf_exporter
+  ):
+    for campaign_id, date in enumerate(
+      ('2024-01-01', '2024-01-02', '2024-01-03'), start=1
+    ):
+      query = (
+        'SELECT campaign.id, metrics.clicks AS clicks FROM campaign '
+        f"WHERE segments.date = '{date}'"
+      )
+      gaarf_exporter.export(
+        GaarfReport(
+          results=[[campaign_id, 10]],
+          column_names=['campaign_id', 'clicks'],
+          query_specification=QuerySpecification(query).generate(),
+        )
+      )
+    metrics = [
+      metric
+      for metric in gaarf_exporter.registry.collect()
+      if metric.name == 'googleads_clicks'
+    ]
+
+    assert len(metrics) == 1
+    assert [sample.labels for sample in metrics[0].samples] == [
+      {'campaign_id': '1'},
+      {'campaign_id': '2'},
+      {'campaign_id': '3'},
+    ]
+
+  def test_export_joins_label_values_from_lists(self, gaarf_exporter):
+    query = (
+      'SELECT campaign.id, campaign.labels AS labels, '
+      'metrics.clicks AS clicks FROM campaign'
+    )
+    report = GaarfReport(
+      results=[[1, [10, 20], 10]],
+      column_names=['campaign_id', 'labels', 'clicks'],
+      query_specification=QuerySpecification(query).generate(),
+    )
+    gaarf_exporter.export(report)
+    metrics = list(gaarf_exporter.registry.collect())
+    for metric in metrics:
+      if metric.name == 'googleads_clicks':
+        assert metric.samples[0].labels == {
+          'campaign_id': '1',
+          'labels': '10,20',
+        }
+
+  def test_reset_registry_removes_exported_metrics(
+    self, gaarf_exporter, report
+  ):
+    gaarf_exporter.export(report)
+    gaarf_exporter.reset_registry()
+    metrics = list(gaarf_exporter.registry.collect())
+
+    assert 'googleads_clicks' not in [metric.name for metric in metrics]
+
+  def test_export_after_reset_registry_exposes_metrics(
+    self, gaarf_exporter, report
+  ):
+    gaarf_exporter.export(report)
+    gaarf_exporter.reset_registry()
+    gaarf_exporter.export(report)
+    metrics = list(gaarf_exporter.registry.collect())
+
+    assert 'googleads_clicks' in [metric.name for metric in metrics]
+
+  def test_export_sets_values_for_several_metrics_and_labels(
+    self, gaarf_exporter
+  ):
+    query = (
+      'SELECT campaign.id, campaign.name AS campaign_name, '
+      'metrics.clicks AS clicks, metrics.impressions AS impressions '
+      'FROM campaign'
+    )
+    report = GaarfReport(
+      results=[[1, 'test', 10, 100]],
+      column_names=['campaign_id', 'campaign_name', 'clicks', 'impressions'],
+      query_specification=QuerySpecification(query).generate(),
+    )
+    gaarf_exporter.export(report)
+    samples_by_metric = {
+      metric.name: metric.samples
+      for metric in gaarf_exporter.registry.collect()
+    }
+    expected_labels = {'campaign_id': '1', 'campaign_name': 'test'}
+
+    assert [
+      (sample.labels, sample.value)
+      for sample in samples_by_metric['googleads_clicks']
+    ] == [(expected_labels, 10.0)]
+    assert [
+      (sample.labels, sample.value)
+      for sample in samples_by_metric['googleads_impressions']
+    ] == [(expected_labels, 100.0)]
+
+  def test_export_exposes_zero_values_when_requested(self, report):
+    report.results[0][1] = 0
+    gaarf_exporter = GaarfExporter(expose_metrics_with_zero_values=True)
+    gaarf_exporter.export(report)
+    metrics = list(gaarf_exporter.registry.collect())
+    for metric in metrics:
+      if metric.name == 'googleads_clicks':
+        assert [sample.value for sample in metric.samples] == [0.0, 20.0]
+
+  def test_export_skips_zero_values_by_default(self, gaarf_exporter, report):
+    report.results[0][1] = 0
+    gaarf_exporter.export(report)
+    metrics = list(gaarf_exporter.registry.collect())
+    for metric in metrics:
+      if metric.name == 'googleads_clicks':
+        assert [sample.value for sample in metric.samples] == [20.0]
+
   def test_gaarf_exporter_raises_value_error_when_url_not_provided(self):
     with pytest.raises(ValueError):
       GaarfExporter(http_server_url=None)
@@ -128,3 +294,49 @@ class TestGaaarfExporter:
   def test_gaarf_exporter_raises_value_error_when_namespace_is_empty(self):
     with pytest.raises(ValueError):
       GaarfExporter(namespace=None)
+
+
+class TestGaarfExporterPushgateway:
+  @pytest.fixture(autouse=True)
+  def http_client(self, monkeypatch):
+    http_client = FakePoolManager()
+    monkeypatch.setattr(urllib3, 'PoolManager', lambda **_: http_client)
+    return http_client
+
+  @pytest.fixture
+  def gaarf_exporter(self):
+    gaarf_exporter = GaarfExporter(pushgateway_url='localhost:9091')
+    gaarf_exporter.delay_gauge.set(60)
+    return gaarf_exporter
+
+  def test_flush_pushes_gzip_compressed_metrics(
+    self, gaarf_exporter, http_client
+  ):
+    http_client.statuses = [200]
+    gaarf_exporter.flush()
+
+    [request] = http_client.requests
+    assert request['headers']['Content-Encoding'] == 'gzip'
+    assert b'googleads_delay_seconds 60.0' in gzip.decompress(request['body'])
+
+  def test_flush_repeats_rejected_compressed_push_uncompressed(
+    self, gaarf_exporter, http_client
+  ):
+    http_client.statuses = [400, 200, 200]
+    gaarf_exporter.flush()
+    gaarf_exporter.flush()
+
+    compressed, *uncompressed = http_client.requests
+    assert 'Content-Encoding' in compressed['headers']
+    for request in uncompressed:
+      assert 'Content-Encoding' not in request['headers']
+      assert b'googleads_delay_seconds 60.0' in request['body']
+
+  @pytest.mark.parametrize('statuses', [(400, 400), (500,)])
+  def test_flush_raises_os_error_when_push_fails(
+    self, gaarf_exporter, http_client, statuses
+  ):
+    http_client.statuses = list(statuses)
+
+    with pytest.raises(OSError, match='pushgateway'):
+      gaarf_exporter.flush()
@@ -0,0 +1,52 @@
+# Copyright 2024 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+import signal
+import threading
+import time
+
+import pytest
+
+from gaarf_exporter import main
+
+pytestmark = pytest.mark.skipif(
+  not hasattr(signal, 'sigtimedwait'), reason='requires sigtimedwait'
+)
+
+
+@pytest.fixture(autouse=True)
+def _blocked_sighup():
+  mask = signal.pthread_sigmask(signal.SIG_BLOCK, set())
+  main.block_export_requests()
+  yield
+  signal.pthread_sigmask(signal.SIG_SETMASK, mask)
+
+
+def test_wait_for_export_request_returns_when_sighup_is_sent_during_wait():
+  main_thread_id = threading.get_ident()
+  timer = threading.Timer(
+    0.1, signal.pthread_kill, args=(main_thread_id, signal.SIGHUP)
+  )
+  timeout = 10
+  timer.start()
+  start = time.monotonic()
+
+  assert main.wait_for_export_request(timeout)
+  assert time.monotonic() - start < timeout
+  timer.join()
+
+
+def test_wait_for_export_request_returns_false_on_timeout():
+  assert not main.wait_for_export_request(0.01)
@@ -34,6 +34,13 @@ class TestRegistry:
 
     assert {collector.name for collector in default_collectors} == expected
 
+  def test_all_subregistries_returns_collectors_from_all_subregistries(
+    self, registry
+  ):
+    expected = registry.find_collectors(','.join(registry.subregistries))
+
+    assert registry.all_subregistries == expected
+
   def test_extract_collector_targets_returns_correct_collectors_from_registry(
     self, registry
   ):
@@ -45,6 +52,17 @@ class TestRegistry:
 
     assert {collector.name for collector in actual} == expected
 
+  def test_extract_collector_targets_ignores_spaces_around_collector_names(
+    self, registry
+  ):
+    actual = registry.find_collectors('performance, mapping')
+    expected = {
+      'mapping',
+      'performance',
+    }
+
+    assert {collector.name for collector in actual} == expected
+
   def test_extract_collector_targets_returns_all_collectors_from_subregistry(
     self, registry
   ):
@@ -69,6 +87,42 @@ class TestRegistry:
 
     assert {collector.name for collector in actual} == expected
 
+  def test_customize_does_not_change_collectors_in_registry(self, registry):
+    original_query = registry.collectors['performance'].query
+    collectors = registry.find_collectors(
+      'performance', service_collectors=False
+    )
+    collectors.customize({'level': 'customer'})
+
+    assert {collector.level for collector in collectors} == {
+      query_collector.CollectorLevel.CUSTOMER
+    }
+    assert registry.collectors['performance'].query == original_query
+
+  def test_customize_all_collectors_does_not_change_registry(self):
+    registry = collector_registry.Registry.from_collector_definitions()
+    original_levels = {
+      collector.name: collector.level for collector in registry.all_collectors
+    }
+    registry.find_collectors('all').customize({'level': 'customer'})
+
+    assert {
+      collector.name: collector.level for collector in registry.all_collectors
+    } == original_levels
+
+  def test_customize_default_collectors_does_not_change_registry(self):
+    registry = collector_registry.Registry.from_collector_definitions()
+    original_levels = {
+      collector.name: collector.level
+      for collector in registry.default_collectors
+    }
+    registry.default_collectors.customize({'level': 'customer'})
+
+    assert {
+      collector.name: collector.level
+      for collector in registry.default_collectors
+    } == original_levels
+
   def test_extract_collector_targets_returns_empty_set_when_collectors_are_not_found(
     self, registry
   ):
@@ -125,6 +179,15 @@ class TestCollectorSet:
       service_collectors=False,
     )
 
+  def test_add_to_empty_collector_set_does_not_affect_other_sets(
+    self, simple_target
+  ):
+    collector_set = collector_registry.CollectorSet()
+    collector_set.add(simple_target)
+
+    assert simple_target in collector_set
+    assert simple_target not in collector_registry.CollectorSet()
+
   def test_collector_set_performs_deduplication(
     self, simple_target, simple_target_at_customer_level
   ):
@@ -134,6 +197,35 @@ class TestCollectorSet:
     assert simple_target_at_customer_level not in collector_set
     assert simple_target in collector_set
 
+  def test_collector_set_keeps_lowest_level_of_several_similar_collectors(
+    self,
+  ):
+    collectors = {
+      query_collector.Collector(name=level.name, metrics='clicks', level=level)
+      for level in (
+        query_collector.CollectorLevel.AD_GROUP,
+        query_collector.CollectorLevel.CAMPAIGN,
+        query_collector.CollectorLevel.CUSTOMER,
+      )
+    }
+    collector_set = collector_registry.CollectorSet(
+      collectors, service_collectors=False
+    )
+
+    assert {collector.name for collector in collector_set} == {'AD_GROUP'}
+
+  def test_collector_set_deduplicates_collectors_added_after_access(
+    self, simple_target, simple_target_at_customer_level
+  ):
+    collector_set = collector_registry.CollectorSet(
+      {simple_target}, service_collectors=False
+    )
+    assert simple_target in collector_set
+
+    collector_set.add(simple_target_at_customer_level)
+
+    assert simple_target_at_customer_level not in collector_set
+
   def test_collector_set_generates_service_target(
     self, simple_target, no_metric_target
   ):
@@ -160,6 +252,25 @@ class TestCollectorSet:
       customized_collector.query
     )
 
+  def test_customize_keeps_customized_collectors_in_set(self, collector_set):
+    collector_set.customize(
+      {'start_date': '2024-01-01', 'end_date': '2024-01-02'}
+    )
+    customized_collector = next(iter(collector_set))
+
+    assert customized_collector in collector_set
+
+  def test_customize_does_not_change_collectors_with_query_text(self):
+    query = 'SELECT campaign.id FROM campaign'
+    collector = query_collector.Collector(name='test', query=query)
+    collector_set = collector_registry.CollectorSet(
+      {collector}, service_collectors=False
+    )
+    collector_set.customize({'level': 'customer'})
+
+    assert collector.level == query_collector.CollectorLevel.AD_GROUP
+    assert collector.query == query
+
   @pytest.mark.parametrize('level', ['ad_group', 'campaign', 'customer'])
   def test_customize_returns_modified_target_level(self, collector_set, level):
     customize_dict = {